@@ -1,6 +1,6 @@
 import json
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -9,10 +9,16 @@ class ConfigLoader:
     def __init__(self, config_path: str):
         self.config_path = Path(config_path)
         self.config: Dict[str, Any] = {}
-        
+        self._stamp: Optional[Tuple[int, int]] = None  # (mtime_ns, size) of the last successful load
+
     def load(self) -> None:
-        """Load and validate the configuration file"""
+        """Load and validate the configuration file (skipped if unchanged since the last load)"""
         try:
+            stat = self.config_path.stat()
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if stamp == self._stamp:
+                return
+
             with open(self.config_path, 'r') as f:
                 self.config = json.load(f)
             
@@ -42,6 +48,7 @@ class ConfigLoader:
                 if not isinstance(self.config['api_settings'][setting], (int, float)):
                     raise ValueError(f"API setting '{setting}' must be a number")
             
+            self._stamp = stamp
             logger.info(f"Successfully loaded configuration from {self.config_path}")
             
         except FileNotFoundError:
@@ -1,19 +1,281 @@
+import ast
+import asyncio
+import concurrent.futures
+import copy
+import dataclasses
 import logging
-import time
+import math
 import re
-from collections import defaultdict
-from typing import Dict, List
+import types
+from collections import Counter, defaultdict, deque
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
 
-from models import Bond, AnalyticEquation
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # Optional: only needed for AnalyticsEngine(jit=True)
+    numba = None
+
+from models import Bond, BondTable, AnalyticEquation
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# One pattern yields an API(name) call, a numeric literal (including forms
+# like 2.5e-3, which would otherwise split into word tokens) or a bare word token
+_FORMULA_RE = re.compile(
+    r'API\((?P<api>.*?)\)'
+    r'|(?<![\w.])(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)(?![\w.])'
+    r'|\b(?P<token>\w+)\b'
+)
+_OPERATOR_WORDS = frozenset({'AND', 'OR', 'NOT'})
+
+def _var_name(field: str) -> str:
+    """Identifier a field reference is compiled to (field names may be Python keywords)"""
+    return f'_v_{field}'
+
+def _api_name(api_name: str) -> str:
+    """Identifier an API(name) call is compiled to"""
+    return f'_api_{api_name}'
+
+# Syntax a formula may use; everything else is rejected when it is parsed
+_BIN_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+_UNARY_OPS = (ast.UAdd, ast.USub)
+# Math functions a formula may call (element-wise over bonds)
+_MATH_FUNCS = types.MappingProxyType({
+    'abs': np.abs,
+    'max': np.maximum,
+    'min': np.minimum,
+    'pow': np.power,
+})
+# Number of arguments each math function takes; NumPy ufuncs would treat an
+# extra positional argument as the output array
+_MATH_ARITY = types.MappingProxyType({'abs': 1, 'max': 2, 'min': 2, 'pow': 2})
+# Globals shared by every compiled formula; never modified after import
+_FORMULA_GLOBALS = {'__builtins__': {}, **_MATH_FUNCS}
+
+# Mock API behaviors: (api_settings, prices) -> one value per bond
+_API_FUNCS: Dict[str, Callable[[Dict[str, float], np.ndarray], np.ndarray]] = {
+    'YIELD': lambda settings, prices: prices * settings['yield_multiplier'],
+    'RISK_FREE_RATE': lambda settings, prices: np.full_like(prices, float(settings['risk_free_rate'])),
+    'VOLATILITY': lambda settings, prices: prices * settings['volatility_multiplier'],
+}
+
+class _FormulaTransformer(ast.NodeTransformer):
+    """Rewrite a parsed formula to read fields from V and API results from A, rejecting unsupported syntax"""
+
+    def __init__(self, references: Dict[str, Tuple[str, str]]):
+        self.references = references  # identifier -> ('V', field) or ('A', api_name)
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+
+    def visit_Constant(self, node: ast.Constant) -> ast.AST:
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError(f"Unsupported constant: {node.value!r}")
+        # Evaluate in floating point like the values themselves: integer-only
+        # calls would otherwise reach the ufuncs as int64 and overflow or
+        # reject negative powers (pow(10, 19), pow(2, -1))
+        return ast.copy_location(ast.Constant(float(node.value)), node)
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if node.id not in self.references:
+            raise NameError(f"name '{node.id}' is not defined")
+        container, key = self.references[node.id]
+        subscript = ast.Subscript(value=ast.Name(container, ast.Load()), slice=ast.Constant(key), ctx=ast.Load())
+        return ast.copy_location(subscript, node)
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        if not isinstance(node.op, _BIN_OPS):
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+        node.left = self.visit(node.left)
+        node.right = self.visit(node.right)
+        return node
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.AST:
+        if not isinstance(node.op, _UNARY_OPS):
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+        node.operand = self.visit(node.operand)
+        return node
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        if not isinstance(node.func, ast.Name) or node.func.id not in _MATH_FUNCS or node.keywords:
+            raise ValueError(f"Unsupported function call: {ast.unparse(node)}")
+        if len(node.args) != _MATH_ARITY[node.func.id]:
+            raise ValueError(f"{node.func.id}() takes {_MATH_ARITY[node.func.id]} argument(s), got {len(node.args)}")
+        node.args = [self.visit(arg) for arg in node.args]
+        return node
+
+def _compile_lambda(field: str, params: List[str], body: ast.expr, namespace: Dict[str, Any]) -> Callable:
+    """Compile an expression tree into a lambda over params, using namespace as its globals"""
+    arguments = ast.arguments(posonlyargs=[], args=[ast.arg(param) for param in params],
+                              kwonlyargs=[], kw_defaults=[], defaults=[])
+    expression = ast.fix_missing_locations(ast.Expression(ast.Lambda(arguments, body)))
+    return eval(compile(expression, f'<eq:{field}>', 'eval'), namespace)
+
+def _compile_formula(field: str, tree: ast.expr) -> Callable[[Dict[str, Any], Dict[str, Any]], Any]:
+    """Compile a rewritten formula tree once into a function of (V, A)"""
+    # The tree only contains whitelisted syntax, so the only globals it can
+    # reach are the math functions
+    return _compile_lambda(field, ['V', 'A'], tree, _FORMULA_GLOBALS)
+
+# Subexpressions shared by several formulas are lifted into synthetic fields
+# named with this prefix, so they are computed once per chunk
+_CSE_PREFIX = '_cse_'
+_CSE_NODES = (ast.BinOp, ast.UnaryOp, ast.Call)
+
+def _field_load(field: str) -> ast.Subscript:
+    """Tree reading a field, as produced by _FormulaTransformer"""
+    return ast.Subscript(value=ast.Name('V', ast.Load()), slice=ast.Constant(field), ctx=ast.Load())
+
+def _tree_references(tree: ast.expr) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """Fields and APIs a rewritten formula tree reads"""
+    fields, apis = set(), set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Subscript):
+            (fields if node.value.id == 'V' else apis).add(node.slice.value)
+    return frozenset(fields), frozenset(apis)
+
+class _FormulaFormatter(ast.NodeTransformer):
+    """Turn V[...]/A[...] lookups back into the field names and API(name) calls of formula syntax"""
+
+    def visit_Subscript(self, node: ast.Subscript) -> ast.AST:
+        name = node.slice.value if node.value.id == 'V' else f'API({node.slice.value})'
+        return ast.copy_location(ast.Name(name, ast.Load()), node)
+
+    def visit_Constant(self, node: ast.Constant) -> ast.AST:
+        # Literals are compiled as floats; show whole numbers as written
+        if node.value.is_integer() and abs(node.value) < 2 ** 53:
+            return ast.copy_location(ast.Constant(int(node.value)), node)
+        return node
+
+def _format_formula(tree: ast.expr) -> str:
+    """Formula text for a rewritten tree, as a user would have written it"""
+    return ast.unparse(_FormulaFormatter().visit(copy.deepcopy(tree)))
+
+class _SubexpressionTable:
+    """Structural keys for formula subtrees, computed bottom-up in one pass
+
+    Equal subexpressions get the same integer key, wherever they occur.
+    """
+
+    def __init__(self):
+        self.ids: Dict[tuple, int] = {}  # structure (type, fields, child keys) -> key
+        self.node_keys: Dict[int, int] = {}  # id(node) -> key, for every node seen
+        self.sizes: List[int] = []  # key -> number of nodes in the subexpression
+        self.shareable: List[bool] = []  # key -> an operation reading at least one input
+        self.reads: List[bool] = []  # key -> contains a V/A lookup
+        self.inner: List[Counter] = []  # key -> shareable subexpressions nested in it, with multiplicity
+
+    def key(self, node: ast.AST) -> int:
+        parts = [type(node).__name__]
+        children = []
+        for _, value in ast.iter_fields(node):
+            if isinstance(value, ast.expr):
+                children.append(self.key(value))
+                parts.append(children[-1])
+            elif isinstance(value, list):
+                children.extend(self.key(item) for item in value)
+                parts.append(tuple(children[len(children) - len(value):]))
+            elif isinstance(value, ast.AST):
+                parts.append(type(value).__name__)  # operator or context
+            else:
+                parts.append((type(value).__name__, value))  # constant, name or lookup key
+        structure = tuple(parts)
+
+        key = self.ids.get(structure)
+        if key is None:
+            key = self.ids[structure] = len(self.sizes)
+            self.sizes.append(1 + sum(self.sizes[child] for child in children))
+            self.reads.append(isinstance(node, ast.Subscript) or any(self.reads[child] for child in children))
+            self.shareable.append(isinstance(node, _CSE_NODES) and self.reads[key])
+            inner = Counter()
+            for child in children:
+                inner.update(self.inner[child])
+                if self.shareable[child]:
+                    inner[child] += 1
+            self.inner.append(inner)
+        self.node_keys[id(node)] = key
+        return key
+
+    def keyed_nodes(self, tree: ast.expr) -> Iterable[Tuple[ast.expr, int]]:
+        """(node, key) for every expression in an already keyed tree"""
+        return ((node, self.node_keys[id(node)]) for node in ast.walk(tree) if isinstance(node, ast.expr))
+
+    def rebuild(self, node: ast.expr, owners: Dict[int, str], keep: Optional[ast.expr] = None) -> ast.expr:
+        """Copy of a tree reading lifted subexpressions (other than keep itself) from their owning fields"""
+        key = self.node_keys[id(node)]
+        if key in owners and node is not keep:
+            return ast.copy_location(_field_load(owners[key]), node)
+        copied = copy.copy(node)
+        for name, value in ast.iter_fields(node):
+            if isinstance(value, ast.expr):
+                setattr(copied, name, self.rebuild(value, owners))
+            elif isinstance(value, list):
+                setattr(copied, name, [self.rebuild(item, owners) for item in value])
+        return copied
+
+class _KernelArguments(ast.NodeTransformer):
+    """Replace V[...]/A[...] lookups with positional parameters of a scalar kernel"""
+
+    def __init__(self):
+        self.lookups: Dict[Tuple[str, str], str] = {}  # (container, key) -> parameter name
+
+    def visit_Subscript(self, node: ast.Subscript) -> ast.AST:
+        lookup = (node.value.id, node.slice.value)
+        if lookup not in self.lookups:
+            self.lookups[lookup] = f'_p{len(self.lookups)}'
+        return ast.copy_location(ast.Name(self.lookups[lookup], ast.Load()), node)
+
+def _jit_formula(field: str, tree: ast.expr) -> Optional[Callable[[Dict[str, Any], Dict[str, Any]], Any]]:
+    """Compile a formula into a Numba ufunc that fuses the whole expression into one loop over bonds"""
+    arguments = _KernelArguments()
+    body = arguments.visit(copy.deepcopy(tree))
+    if not arguments.lookups:
+        return None  # Constant formula, nothing to loop over
+
+    # Compile the scalar expression with NumPy's error model, so division by
+    # zero yields inf/NaN as on the NumPy path instead of raising, then
+    # vectorize a thin wrapper around it. The explicit all-float64 signature
+    # compiles the kernel here, rather than on first call from several chunk
+    # threads at once
+    params = list(arguments.lookups.values())
+    scalar = numba.njit(error_model='numpy')(_compile_lambda(field, params, body, _FORMULA_GLOBALS))
+    scalar_call = ast.Call(ast.Name('_scalar', ast.Load()), [ast.Name(param, ast.Load()) for param in params], [])
+    signature = f"float64({', '.join(['float64'] * len(params))})"
+    kernel = numba.vectorize([signature])(
+        _compile_lambda(field, params, scalar_call, {'__builtins__': {}, '_scalar': scalar})
+    )
+    # Wrap the kernel so it is called like any other compiled formula: f(V, A)
+    call = ast.Call(ast.Name('_kernel', ast.Load()), [
+        ast.Subscript(ast.Name(container, ast.Load()), ast.Constant(key), ast.Load())
+        for container, key in arguments.lookups
+    ], [])
+    return _compile_lambda(field, ['V', 'A'], call, {'__builtins__': {}, '_kernel': kernel})
+
+# Evaluation plan for a request: (fields to evaluate in order, APIs they call,
+# requested fields to report in computation order)
+_Plan = Tuple[Tuple[str, ...], FrozenSet[str], Tuple[str, ...]]
+
 class AnalyticsEngine:
-    def __init__(self, api_settings: Dict[str, float] = None):
+    def __init__(self, api_settings: Dict[str, float] = None, chunk_size: int = 65536, jit: bool = False):
         self.equations: Dict[str, AnalyticEquation] = {}
         self.computation_order: List[str] = []
+        # Equations as evaluated: self.equations with shared subexpressions
+        # lifted into synthetic fields, and the order to compute them in
+        self._execution: Dict[str, AnalyticEquation] = {}
+        self._execution_order: List[str] = []
+        self._prune_cache: Dict[FrozenSet[str], _Plan] = {}  # requested fields -> evaluation plan
+        # Bonds evaluated together per worker task; large, because each task
+        # costs a thread dispatch while NumPy handles big arrays efficiently
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+        self.chunk_size = chunk_size
+        self.jit = jit and numba is not None  # Compile formulas to Numba kernels
+        if jit and numba is None:
+            logger.warning("Numba is not installed; formulas will be evaluated with NumPy")
         self.api_settings = api_settings or {
             'latency': 0.1,
             'yield_multiplier': 0.05,
@@ -28,22 +290,42 @@ class AnalyticsEngine:
             
         field, formula = [x.strip() for x in equation_str.split('=', 1)]
         
-        # Extract API calls - format: API(name)
-        api_calls = set(re.findall(r'API\((.*?)\)', formula))
-        
-        # Remove API calls from formula for dependency analysis
-        formula_no_api = re.sub(r'API\(.*?\)', '', formula)
-        
-        # Extract variable dependencies (words not in quotes)
+        api_calls = set()
         dependencies = set()
-        tokens = re.findall(r'\b\w+\b', formula_no_api)
-        for token in tokens:
-            if (not token.isdigit() and  # not a number
-                token != field and       # not the field itself
-                not token.upper() in ['AND', 'OR', 'NOT']):  # not an operator
+        references = {}
+
+        def rewrite(match: re.Match) -> str:
+            # Collect API calls - format: API(name) - and variable dependencies,
+            # rewriting both into plain identifiers in the same pass
+            api_name, token = match.group('api', 'token')
+            if api_name is not None:
+                api_calls.add(api_name)
+                references[_api_name(api_name)] = ('A', api_name)
+                return _api_name(api_name)
+            if token is None:  # numeric literal
+                return match.group('number')
+            if (token != field and       # not the field itself
+                token not in _MATH_FUNCS and  # not a math function
+                token.upper() not in _OPERATOR_WORDS):  # not an operator
                 dependencies.add(token)
-                
-        return AnalyticEquation(field, formula, dependencies, api_calls)
+                references[_var_name(token)] = ('V', token)
+                return _var_name(token)
+            return token
+
+        # Parse and compile once, so evaluation needs no string or tree handling
+        expression = _FORMULA_RE.sub(rewrite, formula)
+        ast_tree = _FormulaTransformer(references).visit(ast.parse(expression, mode='eval').body)
+
+        return AnalyticEquation(field, formula, frozenset(dependencies), frozenset(api_calls), ast_tree,
+                                self._compile(field, ast_tree))
+
+    def _compile(self, field: str, ast_tree: ast.expr) -> Callable[[Dict[str, Any], Dict[str, Any]], Any]:
+        """Compile a rewritten formula tree into f(V, A)"""
+        function = _compile_formula(field, ast_tree)
+        if self.jit:
+            # Kernels are compiled here and fuse the formula into one loop
+            function = _jit_formula(field, ast_tree) or function
+        return function
 
     def validate_equations(self, equations: List[str]) -> None:
         """Validate equation syntax and check for circular dependencies"""
@@ -62,151 +344,293 @@ class AnalyticsEngine:
             if undefined_deps:
                 raise ValueError(f"Equation for {field} references undefined fields: {undefined_deps}")
 
-        # Check for circular dependencies
-        visited = set()
-        temp_visited = set()
+        # Order and API set only change with the equations, so derive them once
+        # here; the sort also rejects circular dependencies
+        self.topological_sort()
 
-        def detect_cycle(field: str) -> bool:
-            if field in temp_visited:
-                return True
-            if field in visited:
-                return False
-            
-            temp_visited.add(field)
-            for dep in self.equations[field].dependencies:
-                if detect_cycle(dep):
-                    return True
-            temp_visited.remove(field)
-            visited.add(field)
-            return False
-
-        for field in self.equations:
-            if detect_cycle(field):
-                raise ValueError(f"Circular dependency detected involving {field}")
+    def _eliminate_common_subexpressions(self) -> Dict[str, AnalyticEquation]:
+        """Equations to evaluate, with subexpressions shared by several formulas computed only once
+
+        Rebuilt from self.equations on every call, which are left unchanged.
+        """
+        execution = dict(self.equations)
+
+        # Key every subtree once and count how often each shareable one occurs
+        table = _SubexpressionTable()
+        roots = {field: table.key(equation.ast_tree) for field, equation in execution.items()}
+        counts = Counter()
+        first_node = {}
+        for equation in execution.values():
+            for node, key in table.keyed_nodes(equation.ast_tree):
+                if table.shareable[key]:
+                    counts[key] += 1
+                    first_node.setdefault(key, node)
+
+        # Lift from the largest subexpression down. Lifting one with n
+        # occurrences leaves a single copy of everything nested inside it, so
+        # those counts drop accordingly and are only lifted if still shared
+        owners: Dict[int, str] = {}
+        # A field whose whole formula is the subexpression already computes it
+        root_owners = {}
+        for field, key in roots.items():
+            root_owners.setdefault(key, field)
+        synthetic = 0
+        for key in sorted((key for key, count in counts.items() if count > 1), key=table.sizes.__getitem__,
+                          reverse=True):
+            count = counts[key]
+            if count < 2:
+                continue
+            for nested, multiplicity in table.inner[key].items():
+                counts[nested] -= (count - 1) * multiplicity
+            owner = root_owners.get(key)
+            if owner is None:
+                owner = f'{_CSE_PREFIX}{synthetic}'
+                while owner in execution:
+                    owner += '_'
+                synthetic += 1
+            owners[key] = owner
+        if not owners:
+            return execution
+
+        # Rewrite every formula once; owners keep their own expression at the root
+        changed = set()
+        for field, equation in list(execution.items()):
+            root = equation.ast_tree
+            keep = root if owners.get(roots[field]) == field else None
+            if any(key in owners for node, key in table.keyed_nodes(root) if node is not keep):
+                execution[field] = dataclasses.replace(equation, ast_tree=table.rebuild(root, owners, keep))
+                changed.add(field)
+        for key, owner in owners.items():
+            if owner not in execution:
+                # The first occurrence becomes the tree of a new intermediate field
+                node = first_node[key]
+                execution[owner] = AnalyticEquation(owner, _format_formula(node), frozenset(), frozenset(),
+                                                    table.rebuild(node, owners, node), None)
+                changed.add(owner)
+
+        # Dependencies now follow the rewritten trees; recompile what changed.
+        # User fields keep their formula text, so errors still quote it
+        for field in changed:
+            equation = execution[field]
+            dependencies, api_calls = _tree_references(equation.ast_tree)
+            execution[field] = dataclasses.replace(
+                equation, dependencies=dependencies, api_calls=api_calls,
+                function=self._compile(field, equation.ast_tree)
+            )
+        return execution
 
     def topological_sort(self) -> None:
-        """Determine computation order based on dependencies"""
-        visited = set()
-        temp = []
-
-        def visit(field: str):
-            if field in visited:
-                return
-            for dep in self.equations[field].dependencies:
-                visit(dep)
-            visited.add(field)
-            temp.append(field)
-
-        for field in self.equations:
-            visit(field)
-        
-        self.computation_order = temp
+        """Determine computation order and detect cycles, then plan evaluation of the equations"""
+        self.computation_order = self._sort(self.equations)
+        self._execution = self._eliminate_common_subexpressions()
+        # Place the intermediate fields before their consumers
+        self._execution_order = self._sort(self._execution)
+        self._prune_cache.clear()  # Cached plans belong to the previous equations
 
-    def mock_api_call(self, api_name: str, bonds: List[Bond]) -> Dict[str, float]:
-        """Mock external API calls with simulated latency"""
-        time.sleep(self.api_settings['latency'])  # Simulate API latency
-        results = {}
-        
-        # Simulate different API behaviors based on API name
-        for bond in bonds:
-            if api_name == "YIELD":
-                results[bond.identifier] = bond.price_quote * self.api_settings['yield_multiplier']
-            elif api_name == "RISK_FREE_RATE":
-                results[bond.identifier] = self.api_settings['risk_free_rate']
-            elif api_name == "VOLATILITY":
-                results[bond.identifier] = bond.price_quote * self.api_settings['volatility_multiplier']
-            else:
-                results[bond.identifier] = 0.0  # Default
-                logger.warning(f"Unknown API call: {api_name}")
-                
-        return results
-
-    def evaluate_formula(self, formula: str, bond: Bond, computed_values: Dict[str, float], 
-                        api_results: Dict[str, Dict[str, float]]) -> float:
-        """Evaluate formula with given values and API results"""
-        # Create a copy of the formula for substitution
-        eval_formula = formula
-        
-        # Replace API calls with their results
-        for api_name in re.findall(r'API\((.*?)\)', formula):
-            api_value = api_results[api_name][bond.identifier]
-            eval_formula = re.sub(f"API\\({api_name}\\)", str(api_value), eval_formula)
-        
-        # Replace variables with their computed values
-        # Sort variables by length (longest first) to avoid partial replacements
-        variables = sorted(computed_values.keys(), key=len, reverse=True)
-        for var in variables:
-            # Use word boundaries to ensure we're replacing whole words only
-            eval_formula = re.sub(r'\b' + var + r'\b', str(computed_values[var]), eval_formula)
-        
+    @staticmethod
+    def _sort(equations: Dict[str, AnalyticEquation]) -> List[str]:
+        """Order fields after their dependencies, detecting cycles in the same pass (Kahn's algorithm)"""
+        # Count unresolved dependencies and index the dependents of each field
+        in_degree = {field: 0 for field in equations}
+        dependents = defaultdict(list)
+        for field, eq in equations.items():
+            for dep in eq.dependencies:
+                in_degree[field] += 1
+                dependents[dep].append(field)
+
+        queue = deque(field for field, degree in in_degree.items() if degree == 0)
+        order = []
+        while queue:
+            field = queue.popleft()
+            order.append(field)
+            for dependent in dependents[field]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
+
+        # Fields still waiting on dependencies can only be part of a cycle
+        if len(order) != len(equations):
+            cyclic = [field for field, degree in in_degree.items() if degree]
+            raise ValueError(f"Circular dependency detected involving {cyclic}")
+
+        return order
+
+    def _plan_for(self, requested_fields: List[str]) -> _Plan:
+        """Evaluation plan restricted to the requested fields and their transitive dependencies"""
+        # Engines are typically reused for many batches with the same request
+        key = frozenset(requested_fields)
+        plan = self._prune_cache.get(key)
+        if plan is None:
+            plan = self._prune_cache[key] = self._compute_prune(key)
+        return plan
+
+    def _compute_prune(self, requested_fields: FrozenSet[str]) -> _Plan:
+        # Walk only the part of the graph reachable from the request
+        needed = set()
+        stack = [field for field in requested_fields if field in self.equations]
+        while stack:
+            field = stack.pop()
+            if field in needed:
+                continue
+            needed.add(field)
+            stack.extend(dep for dep in self._execution[field].dependencies if dep not in needed)
+
+        order = tuple(field for field in self._execution_order if field in needed)
+        api_calls = frozenset().union(*(self._execution[field].api_calls for field in order))
+        fields = tuple(field for field in self.computation_order if field in requested_fields)
+        return order, api_calls, fields
+
+    async def mock_api_call(self, api_name: str, table: BondTable) -> np.ndarray:
+        """Mock external API calls with simulated latency, returning values aligned with the table"""
+        await asyncio.sleep(self.api_settings['latency'])  # Simulate API latency
+
+        # Simulate different API behaviors based on API name, for all bonds at once
+        api_func = _API_FUNCS.get(api_name)
+        if api_func is None:
+            logger.warning(f"Unknown API call: {api_name}")
+            return np.zeros(len(table))  # Default
+        return api_func(self.api_settings, table.price_quote)
+
+    async def fetch_api_results(self, api_names: Iterable[str], table: BondTable) -> Dict[str, np.ndarray]:
+        """Issue all API calls concurrently, so total latency is that of the slowest call"""
+        api_names = list(api_names)
+        responses = await asyncio.gather(*(self.mock_api_call(api_name, table) for api_name in api_names))
+        return dict(zip(api_names, responses))
+
+    def evaluate_formula(self, equation: AnalyticEquation, bond_count: int, computed_values: Dict[str, np.ndarray],
+                        api_results: Dict[str, np.ndarray]) -> np.ndarray:
+        """Evaluate a compiled equation over all bonds at once"""
         try:
-            # Add basic math functions to evaluation context
-            math_context = {
-                'abs': abs,
-                'max': max,
-                'min': min,
-                'pow': pow,
-                '__builtins__': None  # Restrict built-ins for safety
-            }
-            # Safe eval of the formula
-            return float(eval(eval_formula, math_context, {}))
+            # Per-bond failures (e.g. division by zero) surface as non-finite
+            # values instead of exceptions; _compute_chunk masks them out
+            with np.errstate(all='ignore'):
+                values = equation.function(computed_values, api_results)
+            # Constant formulas evaluate to a scalar - broadcast them to every bond
+            return np.broadcast_to(np.asarray(values, dtype=float), (bond_count,))
         except Exception as e:
-            logger.error(f"Failed to evaluate formula: '{formula}' -> '{eval_formula}'")
-            raise ValueError(f"Failed to evaluate formula '{formula}': {str(e)}")
+            raise ValueError(f"Failed to evaluate formula '{equation.formula}': {str(e)}")
 
-    def compute_analytics(self, bonds: List[Bond], requested_fields: List[str]) -> Dict[str, Dict[str, float]]:
+    def compute_analytics(self, bonds: Union[List[Bond], BondTable],
+                          requested_fields: List[str]) -> Dict[str, Dict[str, float]]:
         """Main computation method"""
-        results = defaultdict(dict)
-        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.compute_analytics_async(bonds, requested_fields))
+
+        # Called from code already running in an event loop (e.g. Jupyter or
+        # an async framework), where asyncio.run is not allowed: run the
+        # computation on its own loop in a separate thread and wait for it
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(
+                lambda: asyncio.run(self.compute_analytics_async(bonds, requested_fields))
+            ).result()
+
+    async def compute_analytics_async(self, bonds: Union[List[Bond], BondTable],
+                                      requested_fields: List[str]) -> Dict[str, Dict[str, float]]:
+        """Main computation method, for callers already running an event loop"""
         # Validate inputs
-        if not bonds or not requested_fields:
+        if bonds is None or not len(bonds) or not requested_fields:
             raise ValueError("Must provide bonds and requested fields")
 
         try:
-            # First, collect all required API calls
-            required_apis = set()
-            for field in self.computation_order:
-                required_apis.update(self.equations[field].api_calls)
-
-            # Execute all required API calls
-            api_results = {}
-            for api_name in required_apis:
-                api_results[api_name] = self.mock_api_call(api_name, bonds)
-
-            # Compute each field in order
-            for bond in bonds:
-                computed_values = {}  # Store intermediate results
-                
-                # Compute all fields in order, not just requested ones
-                for field in self.computation_order:
-                    equation = self.equations[field]
-                    try:
-                        # Check if all dependencies are available
-                        missing_deps = [dep for dep in equation.dependencies if dep not in computed_values]
-                        if missing_deps:
-                            logger.error(f"Missing dependencies for {field}: {missing_deps}")
-                            results[bond.identifier][field] = None
-                            continue
-                            
-                        value = self.evaluate_formula(
-                            equation.formula, 
-                            bond,
-                            computed_values,
-                            api_results
-                        )
-                        computed_values[field] = value
-                        # Only store in results if it's a requested field
-                        if field in requested_fields:
-                            results[bond.identifier][field] = value
-                        
-                    except Exception as e:
-                        logger.error(f"Error computing {field} for bond {bond.identifier}: {str(e)}")
-                        if field in requested_fields:
-                            results[bond.identifier][field] = None
-                        # Don't add failed computation to computed_values
+            # Work on columns rather than Bond objects from here on
+            table = bonds if isinstance(bonds, BondTable) else BondTable.from_bonds(bonds)
+
+            # Only fields the request depends on are evaluated, and only their
+            # APIs are called - concurrently, once for the whole batch
+            order, api_calls, fields = self._plan_for(requested_fields)
+            api_results = await self.fetch_api_results(api_calls, table)
+
+            # Results are kept as one (bonds x requested fields) array, with
+            # NaN marking values that could not be computed
+            field_idx = {field: j for j, field in enumerate(fields)}
+            out = np.full((len(table), len(field_idx)), np.nan)
+
+            # Evaluate chunks of bonds in worker threads; NumPy releases the GIL
+            # inside its array kernels, so large batches can use several cores.
+            # Each chunk writes into its own rows of out
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    tasks = []
+                    for start in range(0, len(table), self.chunk_size):
+                        end = start + self.chunk_size
+                        chunk_api_results = {name: values[start:end] for name, values in api_results.items()}
+                        tasks.append(tg.create_task(asyncio.to_thread(
+                            self._compute_chunk, table[start:end], chunk_api_results, order, field_idx, out[start:end]
+                        )))
+            except ExceptionGroup as group:
+                # Raise the failure itself rather than the TaskGroup's wrapper, so
+                # callers can keep catching e.g. ValueError
+                raise group.exceptions[0]
+
+            # Chunks usually fail the same way, so report each field once per batch
+            errors = {}
+            for task in tasks:
+                for field, message in task.result().items():
+                    errors.setdefault(field, message)
+            for message in errors.values():
+                logger.error(message)
 
         except Exception as e:
             logger.error(f"Error in compute_analytics: {str(e)}")
             raise
 
-        return dict(results) 
\ No newline at end of file
+        return self._assemble_results(table.ids, out, field_idx)
+
+    @staticmethod
+    def _assemble_results(ids: np.ndarray, out: np.ndarray,
+                          field_idx: Dict[str, int]) -> Dict[str, Dict[str, float]]:
+        """Convert the results array into {identifier: {field: value}}, with None for non-finite values"""
+        fields = list(field_idx)
+        return {
+            identifier: {field: value if math.isfinite(value) else None for field, value in zip(fields, row)}
+            for identifier, row in zip(ids.tolist(), out.tolist())
+        }
+
+    def _compute_chunk(self, table: BondTable, api_results: Dict[str, np.ndarray], order: Tuple[str, ...],
+                       field_idx: Dict[str, int], out: np.ndarray) -> Dict[str, str]:
+        """Compute fields in order for one chunk of bonds, writing requested fields into out
+
+        Returns an error message for each field that could not be computed.
+        """
+        errors = {}
+        computed_values = {}  # Store intermediate results, one array per field
+        # Per field (and API), which bonds have a usable value. inf/NaN do not
+        # reliably propagate through arithmetic (1 / inf == 0, min(inf, 5) == 5),
+        # so a value only counts if it is finite and all of its inputs are valid
+        valid = {}
+        api_valid = {name: np.isfinite(values) for name, values in api_results.items()}
+
+        for field in order:
+            equation = self._execution[field]
+            try:
+                # Check if all dependencies are available; only build the
+                # missing set on the (rare) failure path
+                if not equation.dependencies.issubset(computed_values):
+                    missing_deps = equation.dependencies - computed_values.keys()
+                    errors[field] = f"Missing dependencies for {field}: {missing_deps}"
+                    continue  # Its column (if requested) stays NaN
+
+                values = self.evaluate_formula(
+                    equation,
+                    len(table),
+                    computed_values,
+                    api_results
+                )
+                computed_values[field] = values
+                mask = np.isfinite(values)
+                for dep in equation.dependencies:
+                    mask &= valid[dep]
+                for api_name in equation.api_calls:
+                    mask &= api_valid[api_name]
+                valid[field] = mask
+                # Only store in results if it's a requested field
+                if field in field_idx:
+                    out[:, field_idx[field]] = np.where(mask, values, np.nan)
+
+            except Exception as e:
+                errors[field] = f"Error computing {field}: {str(e)}"
+                # Don't add failed computation to computed_values; its column stays NaN
+
+        return errors
\ No newline at end of file
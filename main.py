@@ -26,9 +26,8 @@ def main():
         # Initialize engine with API settings from config
         engine = AnalyticsEngine(api_settings=config.api_settings)
         
-        # Validate and sort equations from config
+        # Validate equations from config (also determines computation order)
         engine.validate_equations(config.equations)
-        engine.topological_sort()
         
         # Compute analytics using requested fields from config
         results = engine.compute_analytics(bonds, config.default_requested_fields)
@@ -1,18 +1,47 @@
+import ast
 import dataclasses
-from typing import Set
+from typing import Any, Callable, Dict, FrozenSet, List
 
-@dataclasses.dataclass
+import numpy as np
+
+@dataclasses.dataclass(slots=True, frozen=True)
 class Bond:
     identifier: str
     pricing_date: str  # YYYYMMDD format
     price_quote: float
 
-@dataclasses.dataclass 
+@dataclasses.dataclass(slots=True, frozen=True, eq=False)  # Arrays have no usable ==/hash
+class BondTable:
+    """Column-oriented (structure-of-arrays) view of a list of bonds"""
+    ids: np.ndarray  # identifiers, dtype=object
+    pricing_date: np.ndarray  # YYYYMMDD strings, dtype=object
+    price_quote: np.ndarray  # float64
+
+    @classmethod
+    def from_bonds(cls, bonds: List[Bond]) -> 'BondTable':
+        return cls(
+            ids=np.array([bond.identifier for bond in bonds], dtype=object),
+            pricing_date=np.array([bond.pricing_date for bond in bonds], dtype=object),
+            price_quote=np.fromiter((bond.price_quote for bond in bonds), dtype=float, count=len(bonds)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: slice) -> 'BondTable':
+        """Slice all columns together (views, not copies)"""
+        if not isinstance(index, slice):
+            raise TypeError(f"BondTable indices must be slices, not {type(index).__name__}")
+        return BondTable(self.ids[index], self.pricing_date[index], self.price_quote[index])
+
+@dataclasses.dataclass(slots=True, frozen=True)
 class AnalyticEquation:
     field: str
     formula: str
-    dependencies: Set[str]
-    api_calls: Set[str]
+    dependencies: FrozenSet[str]
+    api_calls: FrozenSet[str]
+    ast_tree: ast.expr  # formula parsed once by AnalyticsEngine.parse_equation, reading from V/A
+    function: Callable[[Dict[str, Any], Dict[str, Any]], Any]  # ast_tree compiled to f(V, A)
 
 class APICall:
     def __init__(self, name: str):
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+import config_loader
+from config_loader import ConfigLoader
+
+CONFIG = {
+    'equations': ['yield = API(YIELD)', 'risk = yield * 2'],
+    'default_requested_fields': ['risk'],
+    'api_settings': {'latency': 0, 'yield_multiplier': 0.05, 'risk_free_rate': 0.03, 'volatility_multiplier': 0.02},
+}
+
+
+@pytest.fixture
+def json_loads(monkeypatch):
+    """Count how often the config file is actually parsed"""
+    calls = []
+    original = config_loader.json.load
+
+    def load(f):
+        calls.append(f.name)
+        return original(f)
+
+    monkeypatch.setattr(config_loader.json, 'load', load)
+    return calls
+
+
+def _write(path, config):
+    path.write_text(json.dumps(config))
+
+
+def test_unchanged_file_is_not_reloaded(tmp_path, json_loads):
+    path = tmp_path / 'config.json'
+    _write(path, CONFIG)
+    loader = ConfigLoader(str(path))
+
+    loader.load()
+    loader.load()
+
+    assert len(json_loads) == 1
+    assert loader.equations == CONFIG['equations']
+
+
+def test_changed_file_is_reloaded(tmp_path, json_loads):
+    path = tmp_path / 'config.json'
+    _write(path, CONFIG)
+    loader = ConfigLoader(str(path))
+    loader.load()
+
+    _write(path, dict(CONFIG, default_requested_fields=['yield', 'risk']))
+    loader.load()
+
+    assert len(json_loads) == 2
+    assert loader.default_requested_fields == ['yield', 'risk']
+
+
+def test_invalid_file_is_checked_again_on_next_load(tmp_path, json_loads):
+    path = tmp_path / 'config.json'
+    _write(path, {key: value for key, value in CONFIG.items() if key != 'equations'})
+    loader = ConfigLoader(str(path))
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="Missing required section 'equations'"):
+            loader.load()
+
+    assert len(json_loads) == 2
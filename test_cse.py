@@ -0,0 +1,150 @@
+import random
+import time
+
+import pytest
+
+from engine import AnalyticsEngine
+from models import Bond
+
+API_SETTINGS = {'latency': 0, 'yield_multiplier': 0.05, 'risk_free_rate': 0.03, 'volatility_multiplier': 0.02}
+
+EQUATIONS = [
+    'yield = API(YIELD)',
+    'risk_free = API(RISK_FREE_RATE)',
+    'volatility = API(VOLATILITY)',
+    'spread = yield - risk_free',
+    'excess = (yield - risk_free) * 2',
+    'risk = abs(volatility * 3 - yield) + 1',
+    'capped_risk = min(abs(volatility * 3 - yield), 1)',
+    'scaled = max(volatility * 3, spread) / yield',
+]
+FIELDS = [eq.split('=')[0].strip() for eq in EQUATIONS]
+
+BONDS = [
+    Bond('ZERO', '20230601', 0.0),
+    Bond('NEGATIVE', '20230601', -20.0),
+    Bond('PAR', '20230601', 100.0),
+    Bond('PREMIUM', '20230601', 101.5),
+]
+
+
+def _engine(equations=EQUATIONS):
+    engine = AnalyticsEngine(api_settings=API_SETTINGS)
+    engine.validate_equations(equations)
+    return engine
+
+
+def _synthetic(engine):
+    return {field: equation for field, equation in engine._execution.items() if field not in engine.equations}
+
+
+def test_shared_subexpression_is_lifted():
+    engine = _engine(['a = API(YIELD)', 'b = (a * 2 + 1) * 4', 'c = (a * 2 + 1) / 3', 'd = a'])
+
+    synthetic = _synthetic(engine)
+    assert list(synthetic) == ['_cse_0']
+    assert synthetic['_cse_0'].formula == 'a * 2 + 1'
+    assert synthetic['_cse_0'].dependencies == {'a'}
+    assert engine._execution['b'].dependencies == {'_cse_0'}
+    assert engine._execution['c'].dependencies == {'_cse_0'}
+    assert engine._execution_order.index('_cse_0') < engine._execution_order.index('b')
+
+
+def test_whole_formula_is_reused_instead_of_lifted():
+    engine = _engine()
+
+    # spread is exactly (yield - risk_free), so excess reads it directly
+    assert engine._execution['excess'].dependencies == {'spread'}
+    assert not any(equation.formula == 'yield - risk_free' for equation in _synthetic(engine).values())
+
+
+def test_nested_subexpressions_are_lifted():
+    engine = _engine()
+
+    by_formula = {equation.formula: field for field, equation in _synthetic(engine).items()}
+    outer = by_formula['abs(volatility * 3 - yield)']
+    inner = by_formula['volatility * 3']
+    # volatility * 3 is also used on its own by scaled, so it is lifted out of the outer expression too
+    assert engine._execution[outer].dependencies == {inner, 'yield'}
+    assert engine._execution['risk'].dependencies == {outer}
+    assert engine._execution['capped_risk'].dependencies == {outer}
+    assert engine._execution['scaled'].dependencies == {inner, 'spread', 'yield'}
+
+
+def test_public_equations_are_unchanged():
+    engine = _engine()
+
+    assert set(engine.equations) == set(FIELDS)
+    assert engine.equations['excess'].formula == '(yield - risk_free) * 2'
+    assert engine.equations['excess'].dependencies == {'yield', 'risk_free'}
+    assert engine.equations['risk'].dependencies == {'volatility', 'yield'}
+    assert set(engine.computation_order) == set(FIELDS)
+
+
+def test_repeated_validation_rebuilds_the_plan():
+    engine = _engine(['a = API(YIELD)', 'b = a * 2', 'c = a * 2 + 1'])
+    assert engine._execution['c'].dependencies == {'b'}
+
+    # Redefining the field that computed the shared expression must not affect c
+    engine.validate_equations(['b = a * 3'])
+    assert not _synthetic(engine)
+    assert engine._execution['c'].dependencies == {'a'}
+    results = engine.compute_analytics([Bond('PAR', '20230601', 100.0)], ['b', 'c'])
+    assert results['PAR'] == {'b': pytest.approx(15.0), 'c': pytest.approx(11.0)}
+
+    # Validating again does not accumulate intermediate fields
+    engine.validate_equations(['d = (a * 3 + 1) * 2', 'e = (a * 3 + 1) / 2'])
+    engine.validate_equations([])
+    assert len(_synthetic(engine)) == 1
+
+
+def test_results_match_evaluation_without_lifting(monkeypatch):
+    expected_engine = AnalyticsEngine(api_settings=API_SETTINGS)
+    monkeypatch.setattr(expected_engine, '_eliminate_common_subexpressions', lambda: dict(expected_engine.equations))
+    expected_engine.validate_equations(EQUATIONS)
+    assert not _synthetic(expected_engine)
+
+    expected = expected_engine.compute_analytics(BONDS, FIELDS)
+    actual = _engine().compute_analytics(BONDS, FIELDS)
+
+    assert actual.keys() == expected.keys()
+    for identifier, fields in expected.items():
+        assert list(actual[identifier]) == list(fields)
+        assert actual[identifier] == pytest.approx(fields)
+    assert actual['ZERO']['scaled'] is None
+
+
+def _library(size, seed=7):
+    """Dependent formulas with many shared subexpressions, as in a large analytics library"""
+    rnd = random.Random(seed)
+    equations = ['f0 = API(YIELD)', 'f1 = API(VOLATILITY)', 'f2 = API(RISK_FREE_RATE)']
+    for i in range(3, size):
+        a, b, c = (f'f{rnd.randrange(i)}' for _ in range(3))
+        equations.append(f'f{i} = ' + rnd.choice([
+            f'({a} * 2 + {b}) / 3',
+            f'abs({a} - {b}) + {c}',
+            f'max({a} * 2, {c}) - ({a} * 2 + {b})',
+            f'pow({b}, 2) + {a} * 2',
+        ]))
+    return equations
+
+
+def test_validation_scales_to_large_libraries(monkeypatch):
+    equations = _library(200)
+
+    start = time.perf_counter()
+    engine = _engine(equations)
+    elapsed = time.perf_counter() - start
+    assert elapsed < 2.0
+    assert _synthetic(engine)
+
+    expected_engine = AnalyticsEngine(api_settings=API_SETTINGS)
+    monkeypatch.setattr(expected_engine, '_eliminate_common_subexpressions', lambda: dict(expected_engine.equations))
+    expected_engine.validate_equations(equations)
+    fields = list(expected_engine.equations)
+    bonds = [Bond('SMALL', '20230601', 1.0), Bond('PAR', '20230601', 100.0)]
+
+    expected = expected_engine.compute_analytics(bonds, fields)
+    actual = engine.compute_analytics(bonds, fields)
+    for identifier, values in expected.items():
+        assert actual[identifier] == pytest.approx(values, nan_ok=True)
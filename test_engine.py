@@ -0,0 +1,81 @@
+import asyncio
+import warnings
+
+import pytest
+
+from engine import AnalyticsEngine
+from models import Bond
+
+API_SETTINGS = {'latency': 0, 'yield_multiplier': 0.05, 'risk_free_rate': 0.03, 'volatility_multiplier': 0.02}
+
+EQUATIONS = [
+    'yield = API(YIELD)',
+    'risk_free = API(RISK_FREE_RATE)',
+    'volatility = API(VOLATILITY)',
+    'spread = yield - risk_free',
+    'risk = volatility * 2',
+]
+
+BONDS = [Bond('BOND1', '20230601', 100.0), Bond('BOND2', '20230601', 101.5)]
+
+
+def _engine(**kwargs):
+    engine = AnalyticsEngine(api_settings=API_SETTINGS, **kwargs)
+    engine.validate_equations(EQUATIONS)
+    return engine
+
+
+def test_compute_analytics_inside_running_event_loop():
+    engine = _engine()
+    expected = engine.compute_analytics(BONDS, ['spread', 'risk'])
+
+    async def caller():
+        # Synchronous call from async code, as in Jupyter or an async framework
+        return engine.compute_analytics(BONDS, ['spread', 'risk'])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        assert asyncio.run(caller()) == expected
+
+
+@pytest.mark.parametrize('chunk_size', [0, -1])
+def test_chunk_size_must_be_positive(chunk_size):
+    with pytest.raises(ValueError, match='chunk_size'):
+        AnalyticsEngine(api_settings=API_SETTINGS, chunk_size=chunk_size)
+
+
+def test_chunk_failures_are_not_wrapped_in_exception_groups(monkeypatch):
+    engine = _engine(chunk_size=1)
+
+    def fail(*args):
+        raise ValueError('chunk failed')
+
+    monkeypatch.setattr(engine, '_compute_chunk', fail)
+    with pytest.raises(ValueError, match='chunk failed'):
+        engine.compute_analytics(BONDS, ['spread'])
+
+
+@pytest.mark.parametrize('bonds, fields', [(None, ['spread']), ([], ['spread']), (BONDS, [])])
+def test_missing_input_is_rejected(bonds, fields):
+    with pytest.raises(ValueError, match='Must provide bonds and requested fields'):
+        _engine().compute_analytics(bonds, fields)
+
+
+def test_only_apis_needed_by_the_request_are_called(monkeypatch):
+    engine = _engine()
+    called = []
+    original = engine.mock_api_call
+
+    async def record(api_name, table):
+        called.append(api_name)
+        return await original(api_name, table)
+
+    monkeypatch.setattr(engine, 'mock_api_call', record)
+
+    results = engine.compute_analytics(BONDS, ['risk'])
+    assert called == ['VOLATILITY']
+    assert results['BOND1'] == {'risk': pytest.approx(4.0)}
+
+    called.clear()
+    engine.compute_analytics(BONDS, ['spread'])
+    assert sorted(called) == ['RISK_FREE_RATE', 'YIELD']
@@ -0,0 +1,63 @@
+import pytest
+
+from engine import AnalyticsEngine
+from models import Bond
+
+API_SETTINGS = {'latency': 0, 'yield_multiplier': 0.05, 'risk_free_rate': 0.03, 'volatility_multiplier': 0.02}
+
+
+def _compute(equations, fields, bonds=(Bond('PAR', '20230601', 100.0),), jit=False):
+    if jit:
+        pytest.importorskip('numba')
+    engine = AnalyticsEngine(api_settings=API_SETTINGS, jit=jit)
+    engine.validate_equations(equations)
+    return engine.compute_analytics(list(bonds), fields)
+
+
+@pytest.mark.parametrize('jit', [False, True])
+@pytest.mark.parametrize('formula, expected', [
+    ('pow(10, 19)', 1e19),
+    ('a * pow(2, 70)', 5.0 * 2.0 ** 70),
+    ('abs(-9223372036854775808)', 9223372036854775808.0),
+    ('pow(2, -1)', 0.5),
+    ('7 // 2 + 7 % 2', 4.0),
+])
+def test_integer_literals_evaluate_in_floating_point(formula, expected, jit):
+    results = _compute(['a = API(YIELD)', f'x = {formula}'], ['x'], jit=jit)
+
+    assert results['PAR']['x'] == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('formula, expected', [
+    ('1e5', 1e5),
+    ('2.5e-3 * 2', 5e-3),
+    ('1E+2 + .5 + 3.', 103.5),
+    ('a * 1e-2', 0.05),
+])
+def test_numeric_literals_are_not_fields(formula, expected):
+    engine = AnalyticsEngine(api_settings=API_SETTINGS)
+    engine.validate_equations(['a = API(YIELD)', f'x = {formula}'])
+
+    assert engine.equations['x'].dependencies <= {'a'}
+    results = engine.compute_analytics([Bond('PAR', '20230601', 100.0)], ['x'])
+    assert results['PAR']['x'] == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('formula', [
+    'max(1000, 0, API(YIELD))',
+    'min(a)',
+    'pow(a, 2, 3)',
+    'abs(a, 1)',
+    'abs()',
+])
+def test_math_calls_with_wrong_arity_fail_validation(formula):
+    engine = AnalyticsEngine(api_settings=API_SETTINGS)
+
+    with pytest.raises(ValueError, match='argument'):
+        engine.validate_equations(['a = API(YIELD)', f'x = {formula}'])
+
+
+def test_math_calls_with_valid_arity():
+    results = _compute(['a = API(YIELD)', 'x = max(a, 1) + min(a, 1) + abs(-a) + pow(a, 2)'], ['x'])
+
+    assert results['PAR']['x'] == pytest.approx(5 + 1 + 5 + 25)
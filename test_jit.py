@@ -0,0 +1,77 @@
+import math
+import warnings
+
+import pytest
+
+pytest.importorskip('numba')
+
+from engine import AnalyticsEngine
+from models import Bond
+
+API_SETTINGS = {'latency': 0, 'yield_multiplier': 0.05, 'risk_free_rate': 0.03, 'volatility_multiplier': 0.02}
+
+EQUATIONS = [
+    'a = API(YIELD)',
+    'inverse = a ** -1',
+    'reciprocal = 1 / a',
+    'inverse_square = pow(a, -2)',
+    'remainder = 3 % a',
+    'floor_ratio = max(a, 0) // a',
+    'root = (a - 1) ** 0.5',
+    'scaled = abs(a) ** 0.5 / a',
+    'chained = 1 / reciprocal',
+]
+FIELDS = [eq.split('=')[0].strip() for eq in EQUATIONS]
+
+BONDS = [
+    Bond('ZERO', '20230601', 0.0),
+    Bond('NEGATIVE', '20230601', -40.0),
+    Bond('SMALL', '20230601', 10.0),
+    Bond('PAR', '20230601', 100.0),
+    Bond('LARGE', '20230601', 250.0),
+]
+
+
+def _compute(jit, bonds=BONDS, chunk_size=65536):
+    engine = AnalyticsEngine(api_settings=API_SETTINGS, chunk_size=chunk_size, jit=jit)
+    engine.validate_equations(EQUATIONS)
+    return engine.compute_analytics(bonds, FIELDS)
+
+
+def test_jit_matches_numpy_on_zero_and_negative_inputs():
+    expected = _compute(jit=False)
+    actual = _compute(jit=True)
+
+    assert actual.keys() == expected.keys()
+    for identifier, fields in expected.items():
+        assert actual[identifier].keys() == fields.keys()
+        for field, value in fields.items():
+            if value is None:
+                assert actual[identifier][field] is None, (identifier, field)
+            else:
+                assert actual[identifier][field] == pytest.approx(value), (identifier, field)
+
+
+def test_jit_failures_stay_per_bond():
+    results = _compute(jit=True)
+
+    assert results['ZERO']['inverse'] is None
+    assert results['ZERO']['chained'] is None
+    assert results['NEGATIVE']['root'] is None
+    assert math.isclose(results['PAR']['inverse'], 0.2)
+    assert math.isclose(results['LARGE']['chained'], 12.5)
+
+
+def test_jit_kernels_are_compiled_before_chunks_run():
+    numba = pytest.importorskip('numba')
+    bonds = [Bond(f'BOND{i}', '20230601', float(i % 400 - 100)) for i in range(10_000)]
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        actual = _compute(jit=True, bonds=bonds, chunk_size=1000)
+    expected = _compute(jit=False, bonds=bonds, chunk_size=1000)
+
+    assert not [warning for warning in caught if issubclass(warning.category, numba.NumbaWarning)]
+    assert actual.keys() == expected.keys()
+    for identifier, fields in expected.items():
+        assert actual[identifier] == pytest.approx(fields)